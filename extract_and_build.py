@@ -3,17 +3,34 @@
 Simple Project Builder - No String Issues
 """
 
+import logging
 import os
+import sys
+
+log = logging.getLogger("build")
+
+# Directories already created during this run
+_dirs_created = set()
 
 def write_simple_file(path, lines):
     """Write a file with simple lines"""
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, 'w') as f:
-        for line in lines:
-            f.write(line + '\n')
-    print(f"✅ Created: {path}")
+    directory = os.path.dirname(path)
+    if directory not in _dirs_created:
+        os.makedirs(directory, exist_ok=True)
+        _dirs_created.add(directory)
+    payload = ('\n'.join(lines) + '\n').encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    log.info("✅ Created: %s", path)
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s',
+                        handlers=[logging.StreamHandler(sys.stdout)])
     print("🚀 Building Unrestricted AI Project...")
     
     # Create directories
@@ -29,7 +46,8 @@ def main():
     
     for d in dirs:
         os.makedirs(d, exist_ok=True)
-        print(f"📁 Created: {d}")
+        _dirs_created.add(d)
+        log.info("📁 Created: %s", d)
     
     # Create main.py
     write_simple_file("unrestricted-ai/main.py", [
@@ -48,7 +66,10 @@ def main():
         "numpy>=1.21.0",
         "requests>=2.25.0", 
         "Pillow>=8.3.0",
-        "cryptography>=3.4.0"
+        "cryptography>=3.4.0",
+        "watchdog>=2.1.0",
+        "orjson>=3.6.0",
+        "ijson>=3.1"
     ])
     
     # Create AI module
@@ -1,44 +1,332 @@
 #!/usr/bin/env python3
 """
-Auto-Scanning AI - Continuously monitors training data every 60 seconds
+Auto-Scanning AI - Continuously monitors training data (file events, with a periodic scan fallback)
 """
 
 import os
+import argparse
+import ast
 import json
+import logging
+import mmap
+import multiprocessing
+import pickle
 import re
+import sys
 import hashlib
 import time
 import threading
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+logger = logging.getLogger("autoscan")
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; the stdlib parser gives the same result
+    _json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; large JSON files are then loaded whole
+    ijson = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional; fall back to polling only
+    FileSystemEventHandler = object
+    Observer = None
+
+# Patterns used for every processed file, compiled once
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+_SENT_RE = re.compile(r'[.!?]+')
+_DEF_RE = re.compile(r'def (\w+)')
+_CLASS_RE = re.compile(r'class (\w+)')
+
+# Keywords generate_response reacts to, matched against whole input words
+_TOKEN_RE = re.compile(r'[a-z]+')
+_LEARN_KW = frozenset({'learn', 'learns', 'learning', 'learned', 'training', 'data'})
+_CAPABILITY_KW = frozenset({'capabilities', 'capability'})
+_GREETING_KW = frozenset({'hello', 'hi', 'hey'})
+
+# Saved state lives in the user's cache, never in the folder files are ingested from
+STATE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'unrestricted-ai')
+STATE_VERSION = 2  # Bump when the layout of the saved state changes
+MAX_CONVERSATION_PATTERNS = 10000
+DIR_MTIME_SLACK_NS = 2 * 10**9
+FULL_SCAN_EVERY = 12  # While watching, every 12th periodic scan (hourly) lists every directory
+JSON_STREAM_THRESHOLD = 64 * 1024 * 1024  # Stream JSON files larger than this with ijson
+MMAP_THRESHOLD = 1024 * 1024  # Read files at least this large through mmap
+
+TOPICS = {
+    'technology': ['python', 'code', 'program', 'computer', 'ai', 'machine'],
+    'business': ['company', 'business', 'market', 'money', 'profit'],
+    'science': ['research', 'study', 'data', 'analysis', 'experiment'],
+    'creative': ['art', 'design', 'create', 'story', 'character'],
+}
+
+def extract_file(file_path):
+    """Read one training file and return what was learned from it, without touching shared state"""
+    file_ext = os.path.splitext(file_path)[1].lower()
+    
+    extractors = {
+        '.txt': _extract_text_file,
+        '.json': _extract_json_file,
+        '.md': _extract_text_file,
+        '.py': _extract_code_file,
+        '.csv': _extract_text_file,
+    }
+    
+    extractor = extractors.get(file_ext, _extract_text_file)
+    return extractor(file_path)
+
+def _extract_text_file(file_path):
+    """Extract vocabulary, patterns and topics from a text file"""
+    try:
+        return learn_text(_read_text(file_path))
+        
+    except Exception as e:
+        return {'error': f"Error processing {file_path}: {e}"}
+
+def _read_text(file_path):
+    """Read a UTF-8 text file, decoding large ones straight from an mmap to skip a bytes copy"""
+    if os.path.getsize(file_path) < MMAP_THRESHOLD:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = str(mm, 'utf-8')
+    if '\r' in text:
+        # Same newline handling as reading in text mode
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def _extract_json_file(file_path):
+    """Extract structured data from a JSON file"""
+    structured_data = {}
+    try:
+        if ijson is not None and os.path.getsize(file_path) > JSON_STREAM_THRESHOLD:
+            _stream_json_file(file_path, structured_data)
+            return {'structured_data': structured_data}
+        
+        with open(file_path, 'rb') as f:
+            data = _json_loads(f.read())
+        
+        if isinstance(data, dict):
+            learn_from_dict(data, structured_data)
+        elif isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict):
+                    learn_from_dict(item, structured_data)
+                    
+    except Exception as e:
+        # Reported by the parent in merge_learned, so it survives process workers
+        return {'structured_data': structured_data, 'error': f"Error processing JSON {file_path}: {e}"}
+    
+    return {'structured_data': structured_data}
+
+def _stream_json_file(file_path, structured_data):
+    """Learn from a large JSON file record by record, without loading the whole document"""
+    with open(file_path, 'rb') as f:
+        head = f.read(4096).lstrip()
+        f.seek(0)
+        if head.startswith(b'['):
+            for item in ijson.items(f, 'item'):
+                if isinstance(item, dict):
+                    learn_from_dict(item, structured_data)
+        elif head.startswith(b'{'):
+            _learn_from_items(ijson.kvitems(f, ''), structured_data)
+
+def _extract_code_file(file_path):
+    """Extract function and class names from a code file"""
+    try:
+        with open(file_path, 'r') as f:
+            code = f.read()
+        
+        try:
+            functions, classes = _python_names(ast.parse(code))
+        except (SyntaxError, ValueError):
+            # Not valid Python (or another language): fall back to a textual match
+            functions, classes = _DEF_RE.findall(code), _CLASS_RE.findall(code)
+        
+        return {'code_patterns': {'functions': functions, 'classes': classes}}
+        
+    except Exception as e:
+        return {'error': f"Error processing code {file_path}: {e}"}
+
+def _python_names(tree):
+    """Return the function and class names defined anywhere in a parsed module"""
+    functions = []
+    classes = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node.name)
+        elif isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+    return functions, classes
+
+def learn_text(text):
+    """Learn vocabulary, conversation patterns and topics from text, lowercasing it once"""
+    text_lower = text.lower()
+    return {
+        'vocabulary': Counter(_WORD_RE.findall(text_lower)),
+        'conversation_patterns': [s for s in map(str.strip, _SENT_RE.split(text)) if len(s) > 10],
+        'topics': learn_topics(text_lower),
+    }
+
+def learn_topics(text_lower):
+    """Learn topics from lowercased text"""
+    # Each `in` test is a fast C substring search, so a few of them beat one regex pass
+    # that tries every keyword at every position
+    return {topic for topic, keywords in TOPICS.items()
+            if any(keyword in text_lower for keyword in keywords)}
+
+def learn_from_dict(data_dict, structured_data):
+    """Learn from dictionary data"""
+    _learn_from_items(data_dict.items(), structured_data)
+
+def _learn_from_items(items, structured_data):
+    for key, value in items:
+        if isinstance(value, str) and len(value) > 5:
+            structured_data[key] = value
+
+class _TrainingDataHandler(FileSystemEventHandler):
+    """Feed created/modified files to the AI, coalescing bursts of events per path"""
+    
+    def __init__(self, ai, delay=1.0):
+        super().__init__()
+        self.ai = ai
+        self.delay = delay
+        # path -> deadline; re-inserting on every event keeps it ordered by deadline
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._worker = None
+    
+    def on_created(self, event):
+        self._schedule(event)
+    
+    def on_modified(self, event):
+        self._schedule(event)
+    
+    def on_moved(self, event):
+        # Atomic saves and rsync write a temp file, then rename it into place
+        self._schedule(event, event.dest_path)
+    
+    def _schedule(self, event, path=None):
+        path = path or event.src_path
+        if event.is_directory:
+            return
+        with self._cond:
+            self._pending.pop(path, None)
+            self._pending[path] = time.monotonic() + self.delay
+            if self._worker is None:
+                # One debounce thread for all paths, however many files arrive at once
+                self._worker = threading.Thread(target=self._drain, daemon=True)
+                self._worker.start()
+            self._cond.notify()
+    
+    def _drain(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                now = time.monotonic()
+                due = []
+                for path, deadline in self._pending.items():
+                    if deadline > now:
+                        break
+                    due.append(path)
+                if not due:
+                    self._cond.wait(deadline - now)
+                    continue
+                for path in due:
+                    del self._pending[path]
+            
+            for path in due:
+                try:
+                    self.ai.process_changed_file(path)
+                except Exception as e:
+                    logger.error("❌ Watch error: %s", e)
 
 class AutoScanAI:
-    def __init__(self, training_folder="training_data"):
+    def __init__(self, training_folder="training_data", verify=False, parallel='thread'):
         self.training_folder = training_folder
-        self.knowledge_base = {}
-        self.learned_patterns = {}
+        self.verify = verify  # Fingerprint by content hash instead of stat info
+        self.knowledge_base = {
+            'vocabulary': Counter(),  # word -> occurrences
+            # file path -> its word counts, so a re-learned file replaces its old counts
+            'file_vocabulary': {},
+            'topics': set(),
+            'structured_data': {},
+        }
+        self.learned_patterns = {
+            # Keep only the most recent sentences so long-running sessions stay bounded
+            'conversation_patterns': deque(maxlen=MAX_CONVERSATION_PATTERNS),
+            'code_patterns': {},
+        }
         self.processed_files = set()
         self.scan_interval = 60  # Scan every 60 seconds
+        self.watch_scan_interval = 300  # Reconciliation scan while watching for events
         self.is_scanning = False
         self.scan_thread = None
+        self.observer = None
+        self._scan_lock = threading.Lock()
+        self._last_scan_ns = 0  # Directories not modified since then have no new entries
+        self._seen_dirs = set()
+        self._partial_scans = 0  # Scans that skipped unchanged directories since the last full one
+        self._publish_snapshot()
+        self.state_path = self._state_path(training_folder)
+        self._state_dirty = False
         
         print("🔄 AUTO-SCANNING AI INITIALIZED")
         print(f"📁 Monitoring: {training_folder}")
         print(f"⏰ Scan interval: {self.scan_interval} seconds")
         
+        # Resume from the last run so only files changed since then are processed
+        self.load_state()
+        
         # Initial scan
-        self.scan_training_data()
+        self.scan_training_data(parallel=parallel)
         
         # Start continuous scanning
         self.start_continuous_scanning()
     
     def start_continuous_scanning(self):
-        """Start the continuous scanning thread"""
+        """Start watching for file events, with a periodic scan as fallback"""
         self.is_scanning = True
+        
+        if Observer is not None and os.path.isdir(self.training_folder):
+            self.observer = Observer()
+            self.observer.schedule(_TrainingDataHandler(self), self.training_folder, recursive=True)
+            self.observer.daemon = True
+            self.observer.start()
+            # In-place edits made since the initial scan started raised no event; the next scan is full
+            self._partial_scans = FULL_SCAN_EVERY
+            # Events cover normal changes; keep a slow scan for mounts without inotify
+            self.scan_interval = self.watch_scan_interval
+            print(f"👀 Watching {self.training_folder} for changes (rescan every {self.scan_interval} seconds)")
+        
         self.scan_thread = threading.Thread(target=self._continuous_scan)
         self.scan_thread.daemon = True
         self.scan_thread.start()
         print("🎯 Continuous scanning started...")
     
+    def stop_continuous_scanning(self):
+        """Stop the scanning thread and file watcher"""
+        self.is_scanning = False
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer = None
+        
+        with self._scan_lock:
+            if self._state_dirty:
+                self.save_state()
+    
     def _continuous_scan(self):
         """Continuous scanning loop"""
         while self.is_scanning:
@@ -46,190 +334,274 @@ class AutoScanAI:
                 time.sleep(self.scan_interval)
                 new_files = self.scan_training_data()
                 if new_files > 0:
-                    print(f"🔄 Auto-learned from {new_files} new files")
+                    logger.info("🔄 Auto-learned from %d new files", new_files)
             except Exception as e:
-                print(f"❌ Scan error: {e}")
+                logger.error("❌ Scan error: %s", e)
     
-    def scan_training_data(self):
-        """Scan for new files and process them"""
+    def scan_training_data(self, parallel='thread'):
+        """Scan for new files and process them ('process' parallelism is for large bulk scans)"""
         if not os.path.exists(self.training_folder):
-            print("❌ Training data folder not found")
+            logger.error("❌ Training data folder not found")
             return 0
         
-        new_files_count = 0
+        with self._scan_lock:
+            # Directory mtimes only change when entries are added, removed or renamed, so
+            # unchanged directories can be skipped only while file events report edits in place.
+            # Every FULL_SCAN_EVERY scans still lists everything, for edits whose event was lost.
+            if self.observer is not None and self._partial_scans < FULL_SCAN_EVERY:
+                since_ns = self._last_scan_ns
+                self._partial_scans += 1
+            else:
+                since_ns = None
+                self._partial_scans = 0
+            # Taken at the start with some slack, as file timestamps come from a coarser clock
+            self._last_scan_ns = time.time_ns() - DIR_MTIME_SLACK_NS
+            
+            new_files = {}
+            root_mtime_ns = os.stat(self.training_folder).st_mtime_ns
+            for entry in self._iter_files(self.training_folder, root_mtime_ns, since_ns):
+                try:
+                    file_key = self.file_key(entry.path, entry.stat())
+                except OSError:
+                    continue  # Removed or unreadable since it was listed
+                if file_key not in self.processed_files:
+                    new_files.setdefault(file_key, entry.path)
+            
+            if new_files:
+                # Workers only extract; results are merged here in order, so no locking is needed
+                if parallel == 'process':
+                    # Not fork: the logging listener and watcher threads are already running
+                    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                    executor = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(new_files)),
+                                                   mp_context=multiprocessing.get_context(start_method))
+                    chunksize = 32  # Amortize IPC over several files per task
+                else:
+                    executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4, len(new_files)))
+                    chunksize = 1
+                with executor:
+                    results = executor.map(extract_file, new_files.values(), chunksize=chunksize)
+                    for (file_key, file_path), learned in zip(new_files.items(), results):
+                        self.merge_learned(file_path, learned)
+                        self.processed_files.add(file_key)
+                self._publish_snapshot()
+                self._state_dirty = True
+            
+            if self._state_dirty:
+                self.save_state()
         
-        for root, dirs, files in os.walk(self.training_folder):
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_hash = self.hash_file(file_path)
-                
-                if file_hash not in self.processed_files:
-                    self.process_file(file_path)
-                    self.processed_files.add(file_hash)
-                    new_files_count += 1
+        new_files_count = len(new_files)
         
         if new_files_count > 0:
-            print(f"📚 Processed {new_files_count} new files at {datetime.now().strftime('%H:%M:%S')}")
-            self.analyze_learned_knowledge()
+            logger.info("📚 Processed %d new files at %s", new_files_count, datetime.now().strftime('%H:%M:%S'))
+            logger.info("%s", self._knowledge_report())
         
         return new_files_count
     
-    def hash_file(self, file_path):
-        """Generate file hash for tracking"""
+    def process_changed_file(self, file_path):
+        """Process a single file reported by the file watcher, if it is new"""
         try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except:
-            return hashlib.md5(file_path.encode()).hexdigest()
-    
-    def process_file(self, file_path):
-        """Process individual file based on type"""
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        processors = {
-            '.txt': self.process_text_file,
-            '.json': self.process_json_file,
-            '.md': self.process_text_file,
-            '.py': self.process_code_file,
-            '.csv': self.process_text_file,
-        }
+            st = os.stat(file_path)
+        except OSError:
+            return False  # Deleted or renamed before we got to it
+        
+        with self._scan_lock:
+            file_key = self.file_key(file_path, st)
+            if file_key in self.processed_files:
+                return False
+            self.process_file(file_path)
+            self.processed_files.add(file_key)
+            self._publish_snapshot()
+            # Saved by the next periodic scan or on shutdown, not on every event
+            self._state_dirty = True
         
-        processor = processors.get(file_ext, self.process_text_file)
-        processor(file_path)
+        logger.info("🔄 Auto-learned from %s", file_path)
+        return True
     
-    def process_text_file(self, file_path):
-        """Process text files"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            self.learn_vocabulary(content)
-            self.learn_conversation_patterns(content)
-            self.learn_topics(content)
-            
-        except Exception as e:
-            print(f"   ❌ Error processing {file_path}: {e}")
+    @staticmethod
+    def _state_path(training_folder):
+        """Per-folder state file under STATE_DIR, keyed by the folder's absolute path"""
+        folder = os.path.abspath(training_folder).encode('utf-8', 'surrogateescape')
+        return os.path.join(STATE_DIR, hashlib.blake2b(folder, digest_size=16).hexdigest() + '.pkl')
     
-    def process_json_file(self, file_path):
-        """Process JSON files"""
+    def load_state(self):
+        """Restore processed files and learned knowledge saved by a previous run"""
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            if isinstance(data, dict):
-                self.learn_from_dict(data)
-            elif isinstance(data, list):
-                for item in data:
-                    if isinstance(item, dict):
-                        self.learn_from_dict(item)
-                        
+            with open(self.state_path, 'rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return
         except Exception as e:
-            print(f"   ❌ Error processing JSON {file_path}: {e}")
+            logger.error("❌ Could not load saved state, starting fresh: %s", e)
+            return
+        
+        # File keys from the other fingerprint mode (or an older layout) would never match
+        if state.get('version') != STATE_VERSION or state.get('verify') != self.verify:
+            logger.info("💾 Saved state is from a different version or --verify mode, starting fresh")
+            return
+        
+        self.processed_files = state['processed_files']
+        self.knowledge_base = state['knowledge_base']
+        self.learned_patterns = state['learned_patterns']
+        self._publish_snapshot()
+        logger.info("💾 Restored state for %d files", len(self.processed_files))
     
-    def process_code_file(self, file_path):
-        """Process code files"""
+    def save_state(self):
+        """Atomically write processed files and learned knowledge to the state file"""
+        state = {
+            'version': STATE_VERSION,
+            'verify': self.verify,
+            'processed_files': self.processed_files,
+            'knowledge_base': self.knowledge_base,
+            'learned_patterns': self.learned_patterns,
+        }
+        tmp_path = self.state_path + '.tmp'
         try:
-            with open(file_path, 'r') as f:
-                code = f.read()
-            
-            functions = re.findall(r'def (\w+)', code)
-            classes = re.findall(r'class (\w+)', code)
-            
-            if 'code_patterns' not in self.learned_patterns:
-                self.learned_patterns['code_patterns'] = {}
-            
-            self.learned_patterns['code_patterns']['functions'] = functions
-            self.learned_patterns['code_patterns']['classes'] = classes
-            
-        except Exception as e:
-            print(f"   ❌ Error processing code {file_path}: {e}")
+            os.makedirs(STATE_DIR, exist_ok=True)
+            # makedirs leaves an existing directory's mode alone, and the runner may have made it 0755
+            os.chmod(STATE_DIR, 0o700)
+            # Owner-only from the moment it exists, whatever the umask
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.state_path)
+            self._state_dirty = False
+        except OSError as e:
+            logger.error("❌ Could not save state: %s", e)
     
-    def learn_vocabulary(self, text):
-        """Learn vocabulary from text"""
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        unique_words = set(words)
+    def _iter_files(self, folder, mtime_ns, since_ns=None):
+        """Recursively yield DirEntry objects for files under folder, skipping unchanged directories"""
+        skip_files = (since_ns is not None and mtime_ns <= since_ns
+                      and folder in self._seen_dirs)
         
-        if 'vocabulary' not in self.knowledge_base:
-            self.knowledge_base['vocabulary'] = set()
+        try:
+            entries = os.scandir(folder)
+        except OSError:
+            return  # Unreadable or removed directory, like os.walk skips it
+        self._seen_dirs.add(folder)
         
-        self.knowledge_base['vocabulary'].update(unique_words)
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    try:
+                        subdir_mtime_ns = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    yield from self._iter_files(entry.path, subdir_mtime_ns, since_ns)
+                elif not skip_files and entry.is_file():
+                    yield entry
     
-    def learn_conversation_patterns(self, text):
-        """Learn conversation patterns"""
-        sentences = re.split(r'[.!?]+', text)
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 10:
-                if 'conversation_patterns' not in self.learned_patterns:
-                    self.learned_patterns['conversation_patterns'] = []
-                self.learned_patterns['conversation_patterns'].append(sentence)
+    def file_key(self, file_path, st):
+        """Fingerprint a file by (inode, size, mtime) - cheap stat instead of reading it"""
+        if self.verify:
+            return self.hash_file(file_path)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
     
-    def learn_topics(self, text):
-        """Learn topics from text"""
-        topics = {
-            'technology': ['python', 'code', 'program', 'computer', 'ai', 'machine'],
-            'business': ['company', 'business', 'market', 'money', 'profit'],
-            'science': ['research', 'study', 'data', 'analysis', 'experiment'],
-            'creative': ['art', 'design', 'create', 'story', 'character'],
-        }
-        
-        text_lower = text.lower()
-        detected_topics = []
-        
-        for topic, keywords in topics.items():
-            if any(keyword in text_lower for keyword in keywords):
-                detected_topics.append(topic)
-        
-        if detected_topics:
-            if 'topics' not in self.knowledge_base:
-                self.knowledge_base['topics'] = set()
-            self.knowledge_base['topics'].update(detected_topics)
+    def hash_file(self, file_path):
+        """Generate file hash for tracking"""
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(file_path, 'rb', buffering=0) as f:
+                if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                    # Hash the mapped pages directly, no copies into Python buffers
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        digest.update(mm)
+                else:
+                    # Stream in 1 MiB chunks instead of loading the whole file
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(chunk)
+        except OSError:
+            digest = hashlib.blake2b(file_path.encode(), digest_size=16)
+        return digest.hexdigest()
+    
+    def process_file(self, file_path):
+        """Process individual file based on type"""
+        self.merge_learned(file_path, extract_file(file_path))
+    
+    def merge_learned(self, file_path, learned):
+        """Merge the result of extract_file for file_path into the knowledge base"""
+        if 'error' in learned:
+            logger.error("   ❌ %s", learned['error'])
+        if 'vocabulary' in learned:
+            self._replace_file_vocabulary(file_path, learned['vocabulary'])
+        self.knowledge_base['topics'].update(learned.get('topics', ()))
+        self.knowledge_base['structured_data'].update(learned.get('structured_data', {}))
+        self.learned_patterns['conversation_patterns'].extend(learned.get('conversation_patterns', ()))
+        self.learned_patterns['code_patterns'].update(learned.get('code_patterns', {}))
     
-    def learn_from_dict(self, data_dict):
-        """Learn from dictionary data"""
-        for key, value in data_dict.items():
-            if isinstance(value, str) and len(value) > 5:
-                if 'structured_data' not in self.knowledge_base:
-                    self.knowledge_base['structured_data'] = {}
-                self.knowledge_base['structured_data'][key] = value
+    def _replace_file_vocabulary(self, file_path, counts):
+        """Swap a file's previous word counts for new ones, so edits don't count a file twice"""
+        vocabulary = self.knowledge_base['vocabulary']
+        file_vocabulary = self.knowledge_base['file_vocabulary']
+        previous = file_vocabulary.pop(file_path, None)
+        if previous:
+            # Only the file's own words, not a whole-Counter pass like Counter.__isub__
+            for word, count in previous.items():
+                remaining = vocabulary[word] - count
+                if remaining > 0:
+                    vocabulary[word] = remaining
+                else:
+                    del vocabulary[word]
+        if counts:
+            vocabulary.update(counts)
+            file_vocabulary[file_path] = counts
+    
+    def _publish_snapshot(self):
+        """Publish a read-only summary of the knowledge base for status and responses"""
+        # Swapped in with one reference assignment, so readers never need the scan lock
+        # or iterate containers the scanner is still mutating
+        vocabulary = self.knowledge_base['vocabulary']
+        self._snapshot = {
+            'vocab_size': len(vocabulary),
+            'vocab_sample': tuple(word for word, _ in vocabulary.most_common(3)),
+            'topics': frozenset(self.knowledge_base['topics']),
+            'n_patterns': len(self.learned_patterns['conversation_patterns']),
+            'n_files': len(self.processed_files),
+        }
     
     def analyze_learned_knowledge(self):
         """Show current knowledge status"""
-        print("📊 CURRENT KNOWLEDGE:")
+        print(self._knowledge_report())
+    
+    def _knowledge_report(self):
+        """Build the knowledge status block from the current snapshot"""
+        lines = ["📊 CURRENT KNOWLEDGE:"]
         
-        if 'vocabulary' in self.knowledge_base:
-            vocab_size = len(self.knowledge_base['vocabulary'])
-            sample_words = list(self.knowledge_base['vocabulary'])[:3]
-            print(f"   📝 Vocabulary: {vocab_size} words (sample: {', '.join(sample_words)})")
+        snapshot = self._snapshot
+        if snapshot['vocab_size']:
+            lines.append(f"   📝 Vocabulary: {snapshot['vocab_size']} words (sample: {', '.join(snapshot['vocab_sample'])})")
         
-        if 'topics' in self.knowledge_base:
-            print(f"   🎯 Topics: {', '.join(self.knowledge_base['topics'])}")
+        if snapshot['topics']:
+            lines.append(f"   🎯 Topics: {', '.join(snapshot['topics'])}")
         
-        if 'conversation_patterns' in self.learned_patterns:
-            print(f"   💬 Conversation patterns: {len(self.learned_patterns['conversation_patterns'])}")
+        if snapshot['n_patterns']:
+            lines.append(f"   💬 Conversation patterns: {snapshot['n_patterns']}")
         
-        print(f"   📁 Total processed files: {len(self.processed_files)}")
+        lines.append(f"   📁 Total processed files: {snapshot['n_files']}")
+        return '\n'.join(lines)
     
     def generate_response(self, user_input):
         """Generate AI response using learned knowledge"""
         user_lower = user_input.lower()
         
         # Enhanced responses based on learned data
-        if 'vocabulary' in self.knowledge_base and len(self.knowledge_base['vocabulary']) > 0:
-            learned_words = list(self.knowledge_base['vocabulary'])[:3]
-            enhancement = f" [Using learned words: {', '.join(learned_words)}]"
+        snapshot = self._snapshot
+        if snapshot['vocab_sample']:
+            enhancement = f" [Using learned words: {', '.join(snapshot['vocab_sample'])}]"
         else:
             enhancement = ""
         
-        # Context-aware responses
-        if any(word in user_lower for word in ['learn', 'training', 'data']):
+        # Context-aware responses, matched on whole words ('hi' must not match 'this')
+        tokens = set(_TOKEN_RE.findall(user_lower))
+        if tokens & _LEARN_KW:
             return f"I'm continuously learning from your training data{enhancement}. Current knowledge base updated."
         
-        elif any(word in user_lower for word in ['what can you do', 'capabilities']):
-            return f"My capabilities grow as I process more training data{enhancement}. I now understand {len(self.knowledge_base.get('vocabulary', []))} words."
+        elif tokens & _CAPABILITY_KW or 'what can you do' in user_lower:
+            return f"My capabilities grow as I process more training data{enhancement}. I now understand {snapshot['vocab_size']} words."
         
-        elif any(word in user_lower for word in ['hello', 'hi', 'hey']):
-            return f"Hello! I'm actively scanning training data every 60 seconds{enhancement}."
+        elif tokens & _GREETING_KW:
+            if self.observer is not None:
+                return f"Hello! I'm watching training data and learn new files as soon as they appear{enhancement}."
+            return f"Hello! I'm actively scanning training data every {self.scan_interval} seconds{enhancement}."
         
         else:
             responses = [
@@ -245,7 +617,10 @@ class AutoScanAI:
         print("\n" + "="*60)
         print("💬 AUTO-SCANNING AI - INTERACTIVE MODE")
         print("="*60)
-        print("I scan training_data/ every 60 seconds for new files!")
+        if self.observer is not None:
+            print("I pick up new files in training_data/ as soon as they appear!")
+        else:
+            print(f"I scan training_data/ every {self.scan_interval} seconds for new files!")
         print("Type 'status' to see current knowledge, 'quit' to exit")
         
         while True:
@@ -253,7 +628,7 @@ class AutoScanAI:
                 user_input = input("\nYou: ").strip()
                 
                 if user_input.lower() in ['quit', 'exit']:
-                    self.is_scanning = False
+                    self.stop_continuous_scanning()
                     print("🛑 Stopping auto-scanning and exiting...")
                     break
                 
@@ -265,11 +640,35 @@ class AutoScanAI:
                 print(f"AI: {response}")
                 
             except KeyboardInterrupt:
-                self.is_scanning = False
+                self.stop_continuous_scanning()
                 print("\n🛑 Auto-scanning stopped")
                 break
 
+def _start_logging(level):
+    """Send log records through a queue so scanner threads never block on stdout"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    log_queue = SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level)
+    listener.start()
+    return listener
+
 # Run the auto-scanning AI
 if __name__ == "__main__":
-    ai = AutoScanAI()
-    ai.interactive_mode()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Auto-scanning AI")
+    parser.add_argument("--verify", action="store_true",
+                        help="fingerprint files by content hash instead of size/mtime")
+    parser.add_argument("--parallel", choices=["thread", "process"], default="thread",
+                        help="executor for the initial scan; 'process' is faster for large corpora")
+    parser.add_argument("--quiet", action="store_true",
+                        help="only log errors from the scanner")
+    args = parser.parse_args()
+    
+    listener = _start_logging(logging.ERROR if args.quiet else logging.INFO)
+    try:
+        ai = AutoScanAI(verify=args.verify, parallel=args.parallel)
+        ai.interactive_mode()
+    finally:
+        listener.stop()
\ No newline at end of file